@@ -1,12 +1,28 @@
-from flask import Flask, render_template, request, session, send_file, jsonify, flash, redirect, url_for
+from flask import Flask, render_template, request, session, send_file, jsonify, flash, redirect, url_for, make_response, g
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.http import is_resource_modified
 import os
 import logging
+import mimetypes
+import time
 from utils.parser import parse_ticket_data
 from utils.excel import create_excel_file
+from utils.admission import (
+    AdmissionRejected, MAX_INPUT_BYTES, admit, estimate_parse_cost, estimate_export_cost
+)
+from utils.responses import (
+    STATIC_MAX_AGE, compress_response, dataset_etag, dataset_last_modified, static_fingerprint,
+    strip_encoded_etags, restore_encoded_etag
+)
 
 app = Flask(__name__)
+
+XLSX_MIMETYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
 app.secret_key = os.environ.get('SECRET_KEY', 'your-secret-key-change-in-production')
 
+# Reject oversized bodies before Flask reads them; form encoding can triple the paste size
+app.config['MAX_CONTENT_LENGTH'] = MAX_INPUT_BYTES * 3 + 1024
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,6 +70,58 @@ def calculate_priority_stats(data):
     
     return stats
 
+def admission_rejected_response(error):
+    """Render the form with an error message and the matching 413/429 status"""
+    flash(str(error), 'error')
+    response = make_response(render_template('index.html'), error.status_code)
+    if error.retry_after is not None:
+        response.headers['Retry-After'] = str(error.retry_after)
+    return response
+
+@app.url_defaults
+def fingerprint_static_urls(endpoint, values):
+    """Add a content hash to static URLs so they can be cached for a long time"""
+    if endpoint == 'static' and 'filename' in values:
+        fingerprint = static_fingerprint(app.static_folder, values['filename'])
+        if fingerprint:
+            values['v'] = fingerprint
+
+@app.before_request
+def prepare_conditional_request():
+    """Let views match If-None-Match values that carry a compression suffix"""
+    g.etag_encoding = strip_encoded_etags(request.environ)
+
+@app.after_request
+def finalize_response(response):
+    """Apply cache headers to fingerprinted static files and compress the body"""
+    # Only files that were actually served are fingerprinted; a 304 keeps the
+    # long-lived headers so caches do not downgrade their stored copy
+    if (request.endpoint == 'static' and response.status_code in (200, 304)
+            and _has_current_fingerprint()):
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = STATIC_MAX_AGE
+        response.cache_control.immutable = True
+    # A 304 carries no Content-Type; guess it from the path as send_static_file does
+    mimetype = response.mimetype or mimetypes.guess_type(request.path)[0]
+    restore_encoded_etag(response, g.get('etag_encoding'), mimetype)
+    return compress_response(response, request.accept_encodings)
+
+def _has_current_fingerprint():
+    """Check that the static URL's v parameter matches the file's current contents"""
+    fingerprint = request.args.get('v')
+    filename = (request.view_args or {}).get('filename')
+    return bool(fingerprint and filename
+                and fingerprint == static_fingerprint(app.static_folder, filename))
+
+@app.errorhandler(413)
+def request_too_large(error):
+    """Handle request bodies above MAX_CONTENT_LENGTH"""
+    return admission_rejected_response(AdmissionRejected(
+        f'Input is too large. The limit is {MAX_INPUT_BYTES // 1024} KB, please split the paste.',
+        413
+    ))
+
 @app.route('/')
 def index():
     """Display the main form for pasting ticket data"""
@@ -70,8 +138,9 @@ def parse_tickets():
             flash('Please paste some ticket data to process.', 'error')
             return redirect(url_for('index'))
         
-        # Parse the data
-        parsed_data, errors = parse_ticket_data(raw_data)
+        # Parse the data, waiting for an admission slot sized to the input
+        with admit(estimate_parse_cost(raw_data)):
+            parsed_data, errors = parse_ticket_data(raw_data)
         
         if errors:
             flash(f'Parsing errors: {"; ".join(errors)}', 'error')
@@ -86,10 +155,15 @@ def parse_tickets():
         
         # Store parsed data in session for download
         session['parsed_data'] = parsed_data
+        session['parsed_at'] = int(time.time())
         
         return render_template('index.html', data=parsed_data, priority_stats=priority_stats, show_download=True)
         
-        
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
+    except RequestEntityTooLarge:
+        # Let the 413 handler answer instead of the generic error redirect
+        raise
     except Exception as e:
         flash(f'An error occurred: {str(e)}', 'error')
         return redirect(url_for('index'))
@@ -104,16 +178,36 @@ def download_excel():
             flash('No data available for download. Please parse some ticket data first.', 'error')
             return redirect(url_for('index'))
         
-        # Create Excel file in memory
-        excel_file = create_excel_file(parsed_data)
+        # Validators come from the stored dataset, so repeat downloads can skip regeneration
+        etag = dataset_etag(parsed_data)
+        last_modified = dataset_last_modified(session.get('parsed_at'))
+        
+        if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            response = make_response('', 304)
+            response.mimetype = XLSX_MIMETYPE
+            response.set_etag(etag)
+            response.last_modified = last_modified
+        else:
+            # Create Excel file in memory, waiting for an admission slot sized to the data
+            with admit(estimate_export_cost(parsed_data)):
+                excel_file = create_excel_file(parsed_data)
+            
+            response = send_file(
+                excel_file,
+                as_attachment=True,
+                download_name='hubspot_tickets.xlsx',
+                mimetype=XLSX_MIMETYPE,
+                etag=etag,
+                last_modified=last_modified
+            )
         
-        return send_file(
-            excel_file,
-            as_attachment=True,
-            download_name='hubspot_tickets.xlsx',
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+        # Session data is per-user: browsers may keep it but must revalidate
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
         
+    except AdmissionRejected as e:
+        return admission_rejected_response(e)
     except Exception as e:
         flash(f'Error generating Excel file: {str(e)}', 'error')
         return redirect(url_for('index'))
@@ -122,6 +216,7 @@ def download_excel():
 def clear_data():
     """Clear session data"""
     session.pop('parsed_data', None)
+    session.pop('parsed_at', None)
     return redirect(url_for('index'))
 
 if __name__ == '__main__':
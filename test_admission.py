@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Test admission control for /parse and /download
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils import admission
+from utils.admission import AdmissionRejected, admit, choose_lane, LIGHT, HEAVY
+from app import app
+
+def test_admission_lanes():
+    """Test lane selection and size limits"""
+    print("🚦 Testing Admission Lanes...")
+
+    assert choose_lane(100) == LIGHT
+    assert choose_lane(admission.LIGHT_INPUT_BYTES + 1) == HEAVY
+
+    try:
+        choose_lane(admission.MAX_INPUT_BYTES + 1)
+    except AdmissionRejected as e:
+        assert e.status_code == 413
+    else:
+        raise AssertionError('Oversized input was admitted')
+
+    print("✅ Lanes and size limits are correct!")
+    return True
+
+def test_heavy_slot_is_exclusive():
+    """Test that a second heavy request is refused with 429 while light requests still pass"""
+    print("🔒 Testing Heavy Slot Exclusivity...")
+
+    original_lock_dir = admission.LOCK_DIR
+    original_wait = admission.ADMISSION_WAIT_SECONDS
+    admission.LOCK_DIR = tempfile.mkdtemp()
+    admission.ADMISSION_WAIT_SECONDS = 0.01
+    heavy_cost = admission.LIGHT_INPUT_BYTES + 1
+
+    try:
+        with admit(heavy_cost) as lane:
+            assert lane == HEAVY
+
+            try:
+                with admit(heavy_cost):
+                    pass
+            except AdmissionRejected as e:
+                assert e.status_code == 429
+                assert e.retry_after == admission.RETRY_AFTER_SECONDS
+            else:
+                raise AssertionError('Second heavy request was admitted')
+
+            # Small pastes must not queue behind the heavy one
+            with admit(100) as light_lane:
+                assert light_lane == LIGHT
+
+        # Slot is released once the heavy request finishes
+        with admit(heavy_cost) as lane:
+            assert lane == HEAVY
+    finally:
+        admission.LOCK_DIR = original_lock_dir
+        admission.ADMISSION_WAIT_SECONDS = original_wait
+
+    print("✅ Heavy slots are exclusive and light lane stays open!")
+    return True
+
+def hold_global_slot(lock_dir, seconds):
+    """Hold heavy-0.lock from another process, like a second gunicorn worker"""
+    holder = subprocess.Popen(
+        [sys.executable, '-c',
+         'import fcntl, sys, time\n'
+         'f = open(sys.argv[1], "a")\n'
+         'fcntl.flock(f, fcntl.LOCK_EX)\n'
+         'print("locked", flush=True)\n'
+         'time.sleep(float(sys.argv[2]))\n',
+         os.path.join(lock_dir, 'heavy-0.lock'), str(seconds)],
+        stdout=subprocess.PIPE, text=True
+    )
+    assert holder.stdout.readline().strip() == 'locked'
+    return holder
+
+def test_cross_worker_slot():
+    """Test that a heavy slot held by another worker is waited for, then refused with 429"""
+    print("🔗 Testing Cross-Worker Heavy Slot...")
+
+    if admission.fcntl is None:
+        print("⚠️ fcntl not available, skipping")
+        return True
+
+    original_lock_dir = admission.LOCK_DIR
+    original_wait = admission.ADMISSION_WAIT_SECONDS
+    admission.LOCK_DIR = tempfile.mkdtemp()
+    heavy_cost = admission.LIGHT_INPUT_BYTES + 1
+
+    try:
+        # Slot stays busy for the whole wait: 429 after roughly ADMISSION_WAIT_SECONDS
+        admission.ADMISSION_WAIT_SECONDS = 0.3
+        holder = hold_global_slot(admission.LOCK_DIR, 30)
+        try:
+            start = time.monotonic()
+            try:
+                with admit(heavy_cost):
+                    pass
+            except AdmissionRejected as e:
+                assert e.status_code == 429
+                assert e.retry_after == admission.RETRY_AFTER_SECONDS
+                assert 'large requests' in str(e)
+            else:
+                raise AssertionError('Heavy request was admitted while another worker held the slot')
+            assert 0.25 <= time.monotonic() - start < 2
+        finally:
+            holder.kill()
+            holder.wait()
+
+        # Slot frees up during the wait: the request is admitted
+        admission.ADMISSION_WAIT_SECONDS = 5
+        holder = hold_global_slot(admission.LOCK_DIR, 0.2)
+        try:
+            with admit(heavy_cost) as lane:
+                assert lane == HEAVY
+        finally:
+            holder.wait()
+    finally:
+        admission.LOCK_DIR = original_lock_dir
+        admission.ADMISSION_WAIT_SECONDS = original_wait
+
+    print("✅ Cross-worker slot is shared and waited for!")
+    return True
+
+def test_light_lane_busy_message():
+    """Test that a rejected light request is not blamed on large requests"""
+    print("💬 Testing Light Lane Busy Message...")
+
+    original_wait = admission.ADMISSION_WAIT_SECONDS
+    admission.ADMISSION_WAIT_SECONDS = 0.01
+    semaphore = admission._process_slots[LIGHT]
+    for _ in range(admission.LIGHT_SLOTS_PER_PROCESS):
+        semaphore.acquire()
+
+    try:
+        with admit(100):
+            pass
+    except AdmissionRejected as e:
+        assert e.status_code == 429
+        assert 'large requests' not in str(e)
+    else:
+        raise AssertionError('Light request was admitted with all light slots taken')
+    finally:
+        for _ in range(admission.LIGHT_SLOTS_PER_PROCESS):
+            semaphore.release()
+        admission.ADMISSION_WAIT_SECONDS = original_wait
+
+    print("✅ Light lane rejections have their own message!")
+    return True
+
+def test_parse_rejects_oversized_input():
+    """Test that /parse answers 413 for pastes above the limit"""
+    print("📏 Testing Oversized Paste Rejection...")
+
+    client = app.test_client()
+    response = client.post('/parse', data={'ticket_data': 'x' * (admission.MAX_INPUT_BYTES + 1)})
+
+    assert response.status_code == 413
+    assert b'too large' in response.data
+
+    # Bodies above MAX_CONTENT_LENGTH are refused before the form is parsed
+    response = client.post('/parse', data={'ticket_data': 'x' * (app.config['MAX_CONTENT_LENGTH'] + 1)})
+    assert response.status_code == 413
+
+    print("✅ Oversized pastes are rejected with 413!")
+    return True
+
+if __name__ == "__main__":
+    success = (test_admission_lanes()
+               and test_heavy_slot_is_exclusive()
+               and test_cross_worker_slot()
+               and test_light_lane_busy_message()
+               and test_parse_rejects_oversized_input())
+    if success:
+        print("\n🎉 Admission control is working!")
+    else:
+        print("\n❌ Admission control test failed!")
+        sys.exit(1)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Complexity guard tests for the parser against pathological inputs
+"""
+
+import sys
+import os
+import random
+import time
+import tracemalloc
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from utils.parser import parse_ticket_data, MAX_ERRORS
+
+# Longest error message we accept (label + counts + 50-char excerpt)
+MAX_ERROR_LENGTH = 150
+
+def ticket_id(n):
+    return f'{10000000000 + n}'
+
+def make_ticket(n, preview=True, missing_field=False, name=None, owner=None):
+    """Build one ticket in the new HubSpot format"""
+    fields = [
+        ticket_id(n),
+        f'Contact {n} (contact{n}@example.com)',
+        'Open',
+        'Aug 5, 2025 9:00 AM GMT+5:30',
+        'Aug 5, 2025 9:30 AM GMT+5:30',
+        'Aug 5, 2025 9:15 AM GMT+5:30',
+        'High',
+        owner or f'Owner {n}',
+    ]
+    if missing_field:
+        fields.pop(2)
+    header = [name or f'Ticket {n}', '']
+    if preview:
+        header.append('Preview')
+    return '\n'.join(header + fields)
+
+def make_tickets(count, **kwargs):
+    return '\n\n'.join(make_ticket(n, **kwargs) for n in range(count))
+
+def measure(raw_data):
+    """Return (best wall time, peak allocated bytes) for parsing raw_data"""
+    best = None
+    for _ in range(3):
+        start = time.perf_counter()
+        parse_ticket_data(raw_data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    parse_ticket_data(raw_data)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def assert_linear(build, label):
+    """Check time and allocations grow roughly linearly at 1x/10x/100x"""
+    results = {scale: measure(build(scale)) for scale in (1, 10, 100)}
+
+    for small, large in ((1, 10), (10, 100)):
+        small_time, small_peak = results[small]
+        large_time, large_peak = results[large]
+        factor = large // small
+        print(f"   {label} {small}x->{large}x: time x{large_time / small_time:.1f}, memory x{large_peak / small_peak:.1f}")
+        # Quadratic growth would be ~100x per step; allow generous noise above linear
+        assert large_peak <= small_peak * factor * 3, f'{label}: memory grew superlinearly'
+        if small_time > 0.001:
+            assert large_time <= small_time * factor * 4, f'{label}: time grew superlinearly'
+
+def assert_bounded_errors(errors):
+    assert len(errors) <= MAX_ERRORS + 1, f'Too many errors returned: {len(errors)}'
+    for error in errors:
+        assert len(error) <= MAX_ERROR_LENGTH, f'Error message too long: {len(error)} chars'
+
+def test_linear_scaling():
+    """Test that adversarial inputs scale linearly"""
+    print("📈 Testing Linear Scaling...")
+
+    assert_linear(lambda scale: make_tickets(50 * scale), 'well-formed')
+    assert_linear(lambda scale: 'Ticket\n' + '\n' * (20000 * scale) + 'Preview\n' + '1\n' * 8, 'blank lines')
+    assert_linear(lambda scale: 'Ticket\n' + 'Preview\n' * (1000 * scale), 'repeated Preview')
+    assert_linear(lambda scale: make_tickets(50 * scale, missing_field=True), 'missing fields')
+    assert_linear(lambda scale: make_tickets(50 * scale, preview=False, owner='55512345'), 'numeric fields')
+
+    print("✅ Parser scales linearly!")
+    return True
+
+def test_resync_after_malformed_ticket():
+    """Test that one malformed ticket does not shift later tickets"""
+    print("🔁 Testing Resynchronisation...")
+
+    for preview in (True, False):
+        tickets = [make_ticket(n, preview=preview, missing_field=(n == 1)) for n in range(5)]
+        parsed_data, errors = parse_ticket_data('\n\n'.join(tickets))
+
+        assert len(parsed_data) == 4, f'Expected 4 tickets, got {len(parsed_data)}'
+        assert len(errors) == 1 and errors[0].startswith('Ticket 2:'), errors
+        for ticket, n in zip(parsed_data, (0, 2, 3, 4)):
+            assert ticket['TICKET NAME'] == f'Ticket {n}'
+            assert ticket['TICKET ID'] == ticket_id(n)
+            assert ticket['TICKET OWNER'] == f'Owner {n}'
+
+    # All-digit field values must not be mistaken for ticket IDs
+    tickets = [make_ticket(n, owner=('55512345' if n == 1 else None)) for n in range(3)]
+    parsed_data, errors = parse_ticket_data('\n\n'.join(tickets))
+    assert errors == [], errors
+    assert [ticket['TICKET OWNER'] for ticket in parsed_data] == ['Owner 0', '55512345', 'Owner 2']
+
+    tickets = [make_ticket(n, preview=False, name=('12345' if n == 1 else None)) for n in range(3)]
+    parsed_data, errors = parse_ticket_data('\n\n'.join(tickets))
+    assert errors == [], errors
+    assert [ticket['TICKET NAME'] for ticket in parsed_data] == ['Ticket 0', '12345', 'Ticket 2']
+    assert [ticket['TICKET OWNER'] for ticket in parsed_data] == ['Owner 0', 'Owner 1', 'Owner 2']
+
+    # HubSpot shows "Preview" only on the hovered row, so pastes mix both layouts
+    for previews in ((False, False, True, False), (False, True, True, True)):
+        tickets = [make_ticket(n, preview=preview) for n, preview in enumerate(previews)]
+        parsed_data, errors = parse_ticket_data('\n\n'.join(tickets))
+        assert errors == [], errors
+        assert [ticket['TICKET ID'] for ticket in parsed_data] == [ticket_id(n) for n in range(4)]
+
+    # A ticket named "Preview" is followed by its own marker
+    tickets = [make_ticket(n, name=('Preview' if n == 1 else None)) for n in range(3)]
+    parsed_data, errors = parse_ticket_data('\n\n'.join(tickets))
+    assert errors == [], errors
+    assert [ticket['TICKET NAME'] for ticket in parsed_data] == ['Ticket 0', 'Preview', 'Ticket 2']
+
+    print("✅ Later tickets stay aligned after a malformed one!")
+    return True
+
+def test_bounded_error_output():
+    """Test that errors stay short and few for huge or broken inputs"""
+    print("🧱 Testing Bounded Error Output...")
+
+    _, errors = parse_ticket_data(make_tickets(1000, missing_field=True))
+    assert_bounded_errors(errors)
+    assert errors[-1] == f'...and {1000 - MAX_ERRORS} more errors'
+
+    _, errors = parse_ticket_data(('x' * 100000 + '\n') * 10 + '\nPreview\n123')
+    assert_bounded_errors(errors)
+
+    _, errors = parse_ticket_data('\n'.join('a | b' for _ in range(1000)))
+    assert_bounded_errors(errors)
+
+    print("✅ Error output is bounded!")
+    return True
+
+def assert_aligned(parsed_data, count):
+    """Check every parsed ticket's fields belong to the same source ticket"""
+    known = {ticket_id(n): n for n in range(count)}
+    for ticket in parsed_data:
+        assert ticket['TICKET ID'] in known, f'Unknown ticket ID: {ticket["TICKET ID"]}'
+        n = known[ticket['TICKET ID']]
+        for header, expected in (('TICKET NAME', f'Ticket {n}'), ('TICKET OWNER', f'Owner {n}')):
+            assert ticket[header] in (expected, NUMERIC_VALUES[n]), f'{header} misaligned: {ticket}'
+
+# Per-ticket all-digit values swapped into name/owner fields by the fuzzer
+NUMERIC_VALUES = [f'{55500000 + n * 7}' for n in range(20)]
+
+def test_fuzzed_inputs():
+    """Test that shuffled, truncated and numeric-valued ticket lines never crash or misalign"""
+    print("🎲 Testing Fuzzed Inputs...")
+
+    rng = random.Random(26)
+    for preview in (True, False):
+        lines = make_tickets(20, preview=preview).split('\n')
+
+        # Structural damage: only bound the output
+        for _ in range(200):
+            sample = list(lines)
+            for _ in range(rng.randint(1, 10)):
+                action = rng.choice(('drop', 'duplicate', 'blank', 'preview', 'numeric'))
+                position = rng.randrange(len(sample))
+                if action == 'drop':
+                    sample.pop(position)
+                elif action == 'duplicate':
+                    sample.insert(position, sample[position])
+                elif action == 'blank':
+                    sample.insert(position, '')
+                elif action == 'preview':
+                    sample.insert(position, 'Preview')
+                else:
+                    sample[position] = str(rng.randint(10000, 99999999))
+
+            parsed_data, errors = parse_ticket_data('\n'.join(sample))
+            assert_bounded_errors(errors)
+            assert len(parsed_data) <= 22
+
+    # Numeric field values, blank lines, missing fields and Preview on only some
+    # tickets (HubSpot shows it on the hovered row): tickets must stay aligned
+    for layout in ('preview', 'plain', 'mixed'):
+        for _ in range(200):
+            tickets = []
+            for n in range(20):
+                ticket = make_ticket(
+                    n,
+                    preview=layout == 'preview' or (layout == 'mixed' and rng.random() < 0.5),
+                    missing_field=rng.random() < 0.1,
+                    name=NUMERIC_VALUES[n] if rng.random() < 0.3 else None,
+                    owner=NUMERIC_VALUES[n] if rng.random() < 0.3 else None,
+                )
+                if rng.random() < 0.3:
+                    ticket = ticket.replace('\n', '\n\n', rng.randint(1, 5))
+                tickets.append(ticket)
+
+            parsed_data, errors = parse_ticket_data('\n\n'.join(tickets))
+            assert_bounded_errors(errors)
+            assert_aligned(parsed_data, 20)
+
+    print("✅ Fuzzed inputs are handled safely!")
+    return True
+
+if __name__ == "__main__":
+    success = (test_linear_scaling()
+               and test_resync_after_malformed_ticket()
+               and test_bounded_error_output()
+               and test_fuzzed_inputs())
+    if success:
+        print("\n🎉 Parser complexity guards passed!")
+    else:
+        print("\n❌ Parser complexity guard failed!")
+        sys.exit(1)
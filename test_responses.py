@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Test response compression, conditional downloads and static caching
+"""
+
+import sys
+import os
+import gzip
+import re
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from flask import Response
+from werkzeug.datastructures import Accept
+from werkzeug.http import parse_accept_header
+
+from app import app
+from utils import responses
+from utils.responses import compress_response
+
+TICKET = """Database Performance Issue
+
+Preview
+77777777777
+Jane Smith
+In Progress
+Aug 5, 2025 10:00 AM GMT+5:30
+Aug 5, 2025 11:00 AM GMT+5:30
+Aug 5, 2025 10:30 AM GMT+5:30
+High
+Database Admin"""
+
+def test_results_page_compression():
+    """Test that HTML is compressed according to Accept-Encoding"""
+    print("🗜️ Testing Results Page Compression...")
+
+    client = app.test_client()
+    response = client.post('/parse', data={'ticket_data': TICKET}, headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert b'77777777777' in gzip.decompress(response.data)
+
+    if responses.brotli is not None:
+        response = client.get('/', headers={'Accept-Encoding': 'gzip, br'})
+        assert response.headers['Content-Encoding'] == 'br'
+        assert b'<html' in responses.brotli.decompress(response.data)
+
+    response = client.get('/', headers={'Accept-Encoding': 'identity'})
+    assert 'Content-Encoding' not in response.headers
+
+    print("✅ Results page compression is negotiated!")
+    return True
+
+def test_streamed_compression():
+    """Test that streamed responses are compressed chunk by chunk"""
+    print("🌊 Testing Streamed Compression...")
+
+    chunks = [f'row {n},value {n}\n' * 50 for n in range(20)]
+    response = Response((chunk for chunk in chunks), mimetype='text/csv')
+    accept = parse_accept_header('gzip', Accept)
+
+    response = compress_response(response, accept)
+
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Content-Length' not in response.headers
+    assert gzip.decompress(b''.join(response.response)).decode() == ''.join(chunks)
+
+    # The original body is closed even when the client disconnects before streaming starts
+    class TrackedBody:
+        closed = False
+
+        def __iter__(self):
+            return iter([b'x' * 1000])
+
+        def close(self):
+            self.closed = True
+
+    body = TrackedBody()
+    response = Response(body, mimetype='text/css', direct_passthrough=True)
+    response = compress_response(response, accept)
+    assert response.headers['Content-Encoding'] == 'gzip'
+    response.close()
+    assert body.closed
+
+    print("✅ Streamed responses are compressed!")
+    return True
+
+def test_conditional_download():
+    """Test that repeat downloads of the same dataset return 304"""
+    print("🔁 Testing Conditional Downloads...")
+
+    client = app.test_client()
+    client.post('/parse', data={'ticket_data': TICKET})
+
+    response = client.get('/download')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+    last_modified = response.headers['Last-Modified']
+    assert not etag.startswith('W/')
+    assert 'private' in response.headers['Cache-Control']
+
+    vary = response.headers.get('Vary')
+
+    response = client.get('/download', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert response.data == b''
+    # A 304 repeats the Vary of the full response (xlsx is never compressed)
+    assert response.headers.get('Vary') == vary
+
+    response = client.get('/download', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 304
+
+    # A different dataset gets a different validator
+    client.post('/parse', data={'ticket_data': TICKET.replace('High', 'Low')})
+    response = client.get('/download', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+    print("✅ Repeat downloads return 304!")
+    return True
+
+def test_static_fingerprint_caching():
+    """Test that static URLs carry a content hash and long-lived cache headers"""
+    print("📦 Testing Static Asset Caching...")
+
+    client = app.test_client()
+    html = client.get('/', headers={'Accept-Encoding': 'identity'}).data.decode()
+    match = re.search(r'/static/styles\.css\?v=([0-9a-f]+)', html)
+    assert match, 'Stylesheet URL is not fingerprinted'
+
+    response = client.get(match.group(0), headers={'Accept-Encoding': 'identity'})
+    assert response.status_code == 200
+    assert response.cache_control.max_age == responses.STATIC_MAX_AGE
+    assert response.cache_control.immutable
+    assert not response.cache_control.no_cache
+    response.close()
+
+    # Unknown or stale fingerprints must not be cached for a year
+    for url in ('/static/styles.css?v=bogus', '/static/styles.css?v=000000000000', '/static/styles.css'):
+        response = client.get(url, headers={'Accept-Encoding': 'identity'})
+        assert response.status_code == 200
+        assert not response.cache_control.immutable, url
+        assert response.cache_control.max_age != responses.STATIC_MAX_AGE, url
+        response.close()
+
+    print("✅ Static assets are fingerprinted and cached!")
+    return True
+
+def test_static_fingerprint_traversal():
+    """Test that fingerprinting never reads files outside the static folder"""
+    print("🛡️ Testing Static Fingerprint Traversal...")
+
+    for filename in ('../app.py', '../../../etc/passwd', '/etc/passwd', '', '.'):
+        assert responses.static_fingerprint(app.static_folder, filename) is None, filename
+
+    client = app.test_client()
+    misses = responses._hash_file.cache_info().misses
+    for path in ('/static/../app.py', '/static/../../../dev/zero'):
+        response = client.get('/', query_string={'v': 'abc'}, environ_overrides={'PATH_INFO': path})
+        assert response.status_code == 404, path
+        assert not response.cache_control.immutable, path
+    assert responses._hash_file.cache_info().misses == misses, 'A file outside static/ was hashed'
+
+    print("✅ Files outside the static folder are never hashed!")
+    return True
+
+def test_compressed_static_revalidation():
+    """Test that a compressed static file revalidates with its encoded ETag"""
+    print("♻️ Testing Compressed Static Revalidation...")
+
+    client = app.test_client()
+    for encoding in ('gzip', 'br') if responses.brotli is not None else ('gzip',):
+        response = client.get('/static/styles.css', headers={'Accept-Encoding': encoding})
+        assert response.status_code == 200
+        assert response.headers['Content-Encoding'] == encoding
+        etag = response.headers['ETag']
+        assert etag.endswith(f'-{encoding}"')
+        response.close()
+
+        response = client.get('/static/styles.css', headers={'Accept-Encoding': encoding, 'If-None-Match': etag})
+        assert response.status_code == 304, encoding
+        assert response.headers['ETag'] == etag
+        assert 'Accept-Encoding' in response.headers['Vary']
+        response.close()
+
+    # Revalidating the identity representation also varies on Accept-Encoding
+    response = client.get('/static/styles.css', headers={'Accept-Encoding': 'identity'})
+    etag = response.headers['ETag']
+    response.close()
+    response = client.get('/static/styles.css', headers={'Accept-Encoding': 'identity', 'If-None-Match': etag})
+    assert response.status_code == 304
+    assert 'Accept-Encoding' in response.headers['Vary']
+    response.close()
+
+    print("✅ Compressed static files revalidate with 304!")
+    return True
+
+if __name__ == "__main__":
+    success = (test_results_page_compression()
+               and test_streamed_compression()
+               and test_conditional_download()
+               and test_static_fingerprint_caching()
+               and test_static_fingerprint_traversal()
+               and test_compressed_static_revalidation())
+    if success:
+        print("\n🎉 Compression and caching are working!")
+    else:
+        print("\n❌ Compression and caching test failed!")
+        sys.exit(1)
@@ -0,0 +1,202 @@
+"""
+Admission control module for heavy requests
+Caps concurrent parse/export work per process and across gunicorn workers
+"""
+
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows development machines
+    fcntl = None
+
+# Inputs larger than this are rejected before parsing (HTTP 413)
+MAX_INPUT_BYTES = int(os.environ.get('MAX_INPUT_BYTES', 2 * 1024 * 1024))
+
+# Inputs up to this size go through the light lane and never queue behind big ones
+LIGHT_INPUT_BYTES = int(os.environ.get('LIGHT_INPUT_BYTES', 64 * 1024))
+
+# Concurrency limits for each lane
+LIGHT_SLOTS_PER_PROCESS = int(os.environ.get('LIGHT_SLOTS_PER_PROCESS', 4))
+HEAVY_SLOTS_PER_PROCESS = int(os.environ.get('HEAVY_SLOTS_PER_PROCESS', 1))
+HEAVY_SLOTS_GLOBAL = int(os.environ.get('HEAVY_SLOTS_GLOBAL', 1))
+
+# How long a request may wait for a slot before getting HTTP 429
+ADMISSION_WAIT_SECONDS = float(os.environ.get('ADMISSION_WAIT_SECONDS', 0.5))
+
+# Pause between attempts at the cross-worker lock while waiting
+LOCK_POLL_SECONDS = 0.05
+
+# Value of the Retry-After header sent with HTTP 429
+RETRY_AFTER_SECONDS = int(os.environ.get('RETRY_AFTER_SECONDS', 5))
+
+# Directory holding the lock files shared by all workers on this instance
+LOCK_DIR = os.environ.get(
+    'ADMISSION_LOCK_DIR',
+    os.path.join(tempfile.gettempdir(), 'hubspot-ticket-parser-slots')
+)
+
+LIGHT = 'light'
+HEAVY = 'heavy'
+
+_process_slots = {
+    LIGHT: threading.BoundedSemaphore(LIGHT_SLOTS_PER_PROCESS),
+    HEAVY: threading.BoundedSemaphore(HEAVY_SLOTS_PER_PROCESS),
+}
+
+
+class AdmissionRejected(Exception):
+    """Raised when a request is refused before any heavy work starts"""
+
+    def __init__(self, message, status_code, retry_after=None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+def estimate_parse_cost(raw_data):
+    """
+    Estimate the cost of parsing pasted ticket data
+
+    Args:
+        raw_data (str): Raw text input with ticket data
+
+    Returns:
+        int: Estimated cost in bytes of input
+    """
+    return len(raw_data.encode('utf-8')) if raw_data else 0
+
+
+def estimate_export_cost(data):
+    """
+    Estimate the cost of exporting parsed tickets to Excel
+
+    Args:
+        data (list): List of dictionaries with ticket data
+
+    Returns:
+        int: Estimated cost in bytes of cell content
+    """
+    if not data:
+        return 0
+    return sum(len(str(value)) for ticket in data for value in ticket.values())
+
+
+def choose_lane(cost):
+    """
+    Pick the admission lane for a request of the given cost
+
+    Args:
+        cost (int): Estimated cost from estimate_parse_cost/estimate_export_cost
+
+    Returns:
+        str: LIGHT or HEAVY
+
+    Raises:
+        AdmissionRejected: If the cost exceeds MAX_INPUT_BYTES (413)
+    """
+    if cost > MAX_INPUT_BYTES:
+        raise AdmissionRejected(
+            f'Input is too large ({cost // 1024} KB). '
+            f'The limit is {MAX_INPUT_BYTES // 1024} KB, please split the paste.',
+            413
+        )
+    return LIGHT if cost <= LIGHT_INPUT_BYTES else HEAVY
+
+
+class _NoLock:
+    """Stand-in slot for platforms without fcntl"""
+
+    def close(self):
+        pass
+
+
+_NO_LOCK = _NoLock()
+
+
+def _acquire_global_slot(deadline):
+    """
+    Take one of the cross-worker heavy slots, polling until the deadline
+
+    Args:
+        deadline (float): time.monotonic() value after which to give up
+
+    Returns:
+        file or None: Open lock file holding the slot, or None if all stayed busy
+    """
+    if fcntl is None:
+        return _NO_LOCK
+
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    while True:
+        for slot in range(HEAVY_SLOTS_GLOBAL):
+            handle = open(os.path.join(LOCK_DIR, f'heavy-{slot}.lock'), 'a')
+            try:
+                fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return handle
+            except OSError:
+                handle.close()
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        time.sleep(min(LOCK_POLL_SECONDS, remaining))
+
+
+def _busy_error(lane):
+    """
+    Build the 429 error for a request that could not get a slot in its lane
+
+    Args:
+        lane (str): LIGHT or HEAVY
+
+    Returns:
+        AdmissionRejected: Error carrying the Retry-After delay
+    """
+    if lane == HEAVY:
+        message = 'The server is busy processing other large requests. Please try again shortly.'
+    else:
+        message = 'The server is busy processing other requests. Please try again shortly.'
+    return AdmissionRejected(message, 429, retry_after=RETRY_AFTER_SECONDS)
+
+
+@contextmanager
+def admit(cost):
+    """
+    Hold an admission slot for the duration of a heavy operation
+
+    Light requests only compete with other light requests in this process.
+    Heavy requests need a per-process slot and a slot shared by all workers.
+    Both waits together are bounded by ADMISSION_WAIT_SECONDS.
+
+    Args:
+        cost (int): Estimated cost from estimate_parse_cost/estimate_export_cost
+
+    Yields:
+        str: The lane the request was admitted to
+
+    Raises:
+        AdmissionRejected: 413 if the input is too large, 429 if no slot frees up
+    """
+    lane = choose_lane(cost)
+    deadline = time.monotonic() + ADMISSION_WAIT_SECONDS
+
+    semaphore = _process_slots[lane]
+    if not semaphore.acquire(timeout=ADMISSION_WAIT_SECONDS):
+        raise _busy_error(lane)
+
+    global_slot = None
+    try:
+        if lane == HEAVY:
+            global_slot = _acquire_global_slot(deadline)
+            if global_slot is None:
+                raise _busy_error(lane)
+        yield lane
+    finally:
+        if global_slot is not None:
+            global_slot.close()
+        semaphore.release()
@@ -18,6 +18,12 @@ HEADERS = [
     'TICKET OWNER'
 ]
 
+# Ticket IDs in the new HubSpot format are long numbers (e.g. 27333837927)
+TICKET_ID_PATTERN = re.compile(r'^\d{5,}$')
+
+# Maximum number of error messages returned by parse_ticket_data
+MAX_ERRORS = 10
+
 def parse_ticket_data(raw_data):
     """
     Parse raw ticket data into structured format
@@ -40,7 +46,8 @@ def parse_ticket_data(raw_data):
     
     # Check if this is the new HubSpot format (line-by-line)
     if _is_new_hubspot_format(lines):
-        return _parse_new_hubspot_format(lines, errors)
+        parsed_data, errors = _parse_new_hubspot_format(lines, errors)
+        return parsed_data, _cap_errors(errors)
     
     # Legacy format parsing (pipe or tab separated)
     for line_num, line in enumerate(lines, 1):
@@ -71,7 +78,7 @@ def parse_ticket_data(raw_data):
         
         parsed_data.append(ticket_dict)
     
-    return parsed_data, errors
+    return parsed_data, _cap_errors(errors)
 
 def _is_new_hubspot_format(lines):
     """
@@ -123,93 +130,168 @@ def _parse_new_hubspot_format(lines, errors):
     """
     Parse the new HubSpot format where each field is on a separate line
     Handles blank lines and "Preview" lines that should be ignored
-    
+
+    Tickets are located by _split_tickets rather than fixed-size chunks, so a
+    ticket with a missing or extra field is reported on its own and the tickets
+    after it still line up. "Preview" is only skipped when it is the line right
+    after a ticket name, so it may appear on some tickets and not others.
+
     Args:
         lines (list): List of lines from the input
         errors (list): List to append errors to
-        
+
     Returns:
-        list: List of parsed ticket dictionaries
+        tuple: (parsed_data, errors)
     """
     parsed_data = []
-    
-    # Keep original lines but strip whitespace for processing
-    processed_lines = [line.strip() for line in lines]
-    
-    # Process tickets in chunks
-    i = 0
+    entries = [line.strip() for line in lines if line.strip()]
+
     ticket_count = 0
-    
-    while i < len(processed_lines):
-        ticket_count += 1
-        ticket_lines = []
-        
-        # Collect lines for one ticket
-        # Expected format:
-        # 1. Ticket Name
-        # 2. [Blank line] (optional - skip if present)
-        # 3. Preview (optional - skip if present)
-        # 4. Ticket ID
-        # 5. Ticket Contacts
-        # 6. Ticket Status
-        # 7. Create Date
-        # 8. Last Activity Date
-        # 9. Last Customer Reply Date
-        # 10. Priority
-        # 11. Ticket Owner
-        
-        # Skip any initial empty lines
-        while i < len(processed_lines) and not processed_lines[i]:
-            i += 1
-        
-        # Get ticket name (first non-empty line)
-        if i < len(processed_lines) and processed_lines[i]:
-            ticket_lines.append(processed_lines[i])
-            i += 1
+    for begin, end in _split_tickets(entries):
+        ticket_lines = entries[begin:end]
+
+        # Drop the "Preview" marker that follows the ticket name
+        if len(ticket_lines) > 1 and ticket_lines[1].lower() == 'preview':
+            ticket_lines = ticket_lines[:1] + ticket_lines[2:]
+
+        # A segment with no anchor inside (e.g. non-numeric IDs without Preview)
+        # holding a whole number of tickets is split rather than rejected
+        if len(ticket_lines) % len(HEADERS) == 0:
+            chunks = [ticket_lines[j:j + len(HEADERS)] for j in range(0, len(ticket_lines), len(HEADERS))]
         else:
-            # No more content
-            break
-        
-        # Skip any blank lines after ticket name
-        while i < len(processed_lines) and not processed_lines[i]:
-            i += 1
-        
-        # Check if next line is "Preview" and skip it
-        if i < len(processed_lines) and processed_lines[i].lower() == 'preview':
-            i += 1  # Skip "Preview"
-            
-            # Skip any blank lines after "Preview"
-            while i < len(processed_lines) and not processed_lines[i]:
-                i += 1
-        
-        # Collect the remaining 8 fields (ID, Contacts, Status, Create Date, Last Activity, Last Reply, Priority, Owner)
-        fields_needed = 8
-        for field_num in range(fields_needed):
-            # Skip any blank lines before each field
-            while i < len(processed_lines) and not processed_lines[i]:
-                i += 1
-            
-            if i < len(processed_lines) and processed_lines[i]:
-                ticket_lines.append(processed_lines[i])
-                i += 1
-            else:
-                break
-        
-        # Validate we have exactly 9 fields
-        if len(ticket_lines) != 9:
-            errors.append(f'Ticket {ticket_count}: Expected 9 fields, got {len(ticket_lines)}. Fields found: {ticket_lines}')
-            # Try to continue parsing if there might be more tickets
-            continue
-        
-        # Create ticket dictionary
-        ticket_dict = {}
-        for header, value in zip(HEADERS, ticket_lines):
-            ticket_dict[header] = value.strip() if value else ''
-        
-        parsed_data.append(ticket_dict)
-    
+            chunks = [ticket_lines]
+
+        for chunk in chunks:
+            ticket_count += 1
+
+            # Validate we have exactly 9 fields
+            if len(chunk) != len(HEADERS):
+                errors.append(_format_ticket_error(f'Ticket {ticket_count}', chunk))
+                continue
+
+            # Create ticket dictionary
+            ticket_dict = {}
+            for header, value in zip(HEADERS, chunk):
+                ticket_dict[header] = value.strip() if value else ''
+
+            parsed_data.append(ticket_dict)
+
     return parsed_data, errors
 
+def _split_tickets(entries):
+    """
+    Split non-empty lines into per-ticket segments
+
+    A well-formed ticket is a name, an optional "Preview" marker, then the ID
+    and seven more fields. Without a marker the ID has to look like one: a long
+    all-digit line not followed within two lines by another (a real ID is
+    followed by contacts and status). Any field can be all digits, so segments
+    are chosen to give the most well-formed tickets: each one scores +1 (0 if
+    what follows cannot start a ticket) and each malformed segment -1.
+    Malformed segments only end where a ticket could start, so a bad ticket is
+    reported on its own and later ones stay aligned. A ticket named "Preview"
+    is recognised by the marker line that follows it.
+
+    Args:
+        entries (list): Non-empty, stripped lines
+
+    Returns:
+        list: (begin, end) index pairs covering all of entries
+    """
+    n = len(entries)
+    width = len(HEADERS)
+    is_preview = [entry.lower() == 'preview' for entry in entries] + [False, False, False]
+    is_digits = [bool(TICKET_ID_PATTERN.match(entry)) for entry in entries] + [False, False, False]
+
+    # A marker rather than a ticket named "Preview" (which is followed by its marker)
+    bare = [is_preview[i] and not is_preview[i + 1] for i in range(n)] + [False, False]
+
+    # length[p]: size of a well-formed ticket starting at p, or 0 if none can start there
+    length = [0] * (n + 1)
+    for p in range(n):
+        if bare[p]:
+            continue
+        if is_preview[p + 1]:
+            length[p] = width + 1
+        elif is_digits[p + 1] and not is_digits[p + 2] and not is_digits[p + 3]:
+            length[p] = width
+
+    if not any(length):
+        # Nothing to resync on: fall back to fixed-size chunks
+        return [(p, min(p + width, n)) for p in range(0, n, width)]
+
+    # bare_before[i]: number of markers in entries[:i]
+    bare_before = [0] * (n + 1)
+    for i in range(n):
+        bare_before[i + 1] = bare_before[i] + bare[i]
+
+    # best[q]: score of the best split of entries[:q]; parent[q]: where its last segment began
+    best = [None] * (n + 1)
+    parent = [None] * (n + 1)
+    best[0] = 0
+    running_score = running_at = None  # best boundary before q for a malformed segment
+    for q in range(n + 1):
+        if q > 0 and running_at is not None and (q == n or length[q]):
+            if best[q] is None or running_score - 1 > best[q]:
+                best[q] = running_score - 1
+                parent[q] = running_at
+        score = best[q]
+        if score is None:
+            continue
+
+        # A name followed by a marker always starts a ticket: malformed segments
+        # may not run across it, so each broken ticket is reported separately
+        if running_at is None or score > running_score or bare[q + 1]:
+            running_score, running_at = score, q
+
+        size = length[q]
+        end = q + size
+        # Only the line after the name may be a marker; one right after the end
+        # would mean the last line is really the next ticket's name
+        if size and end <= n and bare_before[min(end + 1, n)] == bare_before[q + 2]:
+            # A ticket followed by something that cannot start one earns no credit
+            score += 1 if end == n or length[end] else 0
+            if best[end] is None or score > best[end]:
+                best[end] = score
+                parent[end] = q
+
+    segments = []
+    end = n
+    while end > 0:
+        begin = parent[end]
+        segments.append((begin, end))
+        end = begin
+    return segments[::-1]
+
+def _format_ticket_error(label, ticket_lines):
+    """
+    Build a bounded error message for a ticket with the wrong number of fields
+
+    Args:
+        label (str): Prefix identifying the ticket
+        ticket_lines (list): Field lines collected for the ticket
+
+    Returns:
+        str: Error message quoting at most the first field
+    """
+    first = ticket_lines[0] if ticket_lines else ''
+    return (f'{label}: Expected {len(HEADERS)} fields, got {len(ticket_lines)} - '
+            f'"{first[:50]}{"..." if len(first) > 50 else ""}"')
+
+def _cap_errors(errors):
+    """
+    Limit the number of error messages returned to the caller
+
+    Args:
+        errors (list): List of error messages
+
+    Returns:
+        list: At most MAX_ERRORS messages plus a summary of the rest
+    """
+    if len(errors) <= MAX_ERRORS:
+        return errors
+    return errors[:MAX_ERRORS] + [f'...and {len(errors) - MAX_ERRORS} more errors']
+
 def validate_ticket_data(data):
     """
     Additional validation for parsed ticket data
@@ -0,0 +1,233 @@
+"""
+Response helpers for HubSpot ticket data
+Handles compression, validators for the stored dataset and static fingerprints
+"""
+
+import hashlib
+import json
+import os
+import re
+import zlib
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from werkzeug.security import safe_join
+from werkzeug.wsgi import ClosingIterator
+
+try:
+    import brotli
+except ImportError:  # gzip is still negotiated when brotli is not installed
+    brotli = None
+
+# Content types worth compressing (xlsx files are already zip archives)
+COMPRESSIBLE_MIMETYPES = {
+    'text/html',
+    'text/css',
+    'text/plain',
+    'text/csv',
+    'application/javascript',
+    'application/json',
+}
+
+# Bodies smaller than this are sent as-is
+MIN_COMPRESS_BYTES = 500
+
+# Cache lifetime for fingerprinted static files (one year)
+STATIC_MAX_AGE = 365 * 24 * 60 * 60
+
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+# Read size when hashing static files
+HASH_CHUNK_BYTES = 64 * 1024
+
+# Suffix compress_response appends to the ETag of an encoded representation
+ENCODED_ETAG_SUFFIX = re.compile(r'-(gzip|br)(?=")')
+
+def choose_encoding(accept_encodings):
+    """
+    Pick the best content encoding the client accepts
+
+    Args:
+        accept_encodings (werkzeug.datastructures.Accept): Parsed Accept-Encoding header
+
+    Returns:
+        str or None: 'br', 'gzip' or None for identity
+    """
+    if brotli is not None and accept_encodings.quality('br') > 0:
+        return 'br'
+    if accept_encodings.quality('gzip') > 0:
+        return 'gzip'
+    return None
+
+def _compressor(encoding):
+    """
+    Create an incremental compressor for the given encoding
+
+    Returns:
+        tuple: (compress, flush) callables taking/returning bytes
+    """
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+def _compress_stream(chunks, encoding):
+    """Compress an iterable of byte chunks without buffering the whole body"""
+    compress, flush = _compressor(encoding)
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield flush()
+
+def compress_response(response, accept_encodings):
+    """
+    Compress a response body in place when the client and content type allow it
+    Streamed responses (files, generators) are compressed chunk by chunk
+
+    Args:
+        response (werkzeug.wrappers.Response): Outgoing response
+        accept_encodings (werkzeug.datastructures.Accept): Parsed Accept-Encoding header
+
+    Returns:
+        werkzeug.wrappers.Response: The same response, possibly compressed
+    """
+    if (response.status_code != 200
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES):
+        return response
+
+    response.vary.add('Accept-Encoding')
+
+    encoding = choose_encoding(accept_encodings)
+    if encoding is None:
+        return response
+
+    if response.is_streamed or response.direct_passthrough:
+        if response.content_length is not None and response.content_length < MIN_COMPRESS_BYTES:
+            return response
+        # Close the original body (e.g. an open static file) even if streaming never starts
+        source = response.response
+        callbacks = [source.close] if hasattr(source, 'close') else []
+        response.response = ClosingIterator(_compress_stream(response.iter_encoded(), encoding), callbacks)
+        response.direct_passthrough = False
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < MIN_COMPRESS_BYTES:
+            return response
+        compress, flush = _compressor(encoding)
+        response.set_data(compress(data) + flush())
+
+    response.headers['Content-Encoding'] = encoding
+    response.headers.pop('Accept-Ranges', None)
+
+    # Each encoding is a separate representation and needs its own strong ETag
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f'{etag}-{encoding}', weak=weak)
+
+    return response
+
+def strip_encoded_etags(environ):
+    """
+    Remove the encoding suffix from If-None-Match before the view checks it
+    Views compare against their own ETag, which never carries the suffix
+
+    Args:
+        environ (dict): WSGI environment of the incoming request
+
+    Returns:
+        str or None: Encoding whose suffix was removed, or None
+    """
+    header = environ.get('HTTP_IF_NONE_MATCH')
+    if not header:
+        return None
+    encodings = ENCODED_ETAG_SUFFIX.findall(header)
+    if not encodings:
+        return None
+    environ['HTTP_IF_NONE_MATCH'] = ENCODED_ETAG_SUFFIX.sub('', header)
+    return encodings[-1]
+
+def restore_encoded_etag(response, encoding, mimetype=None):
+    """
+    Put the encoding suffix back on the ETag of a 304 response
+    The client revalidated an encoded representation and expects its ETag back.
+    The 304 also repeats the Vary header the full response would have carried.
+
+    Args:
+        response (werkzeug.wrappers.Response): Outgoing response
+        encoding (str or None): Value returned by strip_encoded_etags
+        mimetype (str or None): Content type of the full response (a 304 has none)
+
+    Returns:
+        werkzeug.wrappers.Response: The same response
+    """
+    if response.status_code != 304:
+        return response
+    if encoding or mimetype in COMPRESSIBLE_MIMETYPES:
+        response.vary.add('Accept-Encoding')
+    if encoding:
+        etag, weak = response.get_etag()
+        if etag and not etag.endswith(f'-{encoding}'):
+            response.set_etag(f'{etag}-{encoding}', weak=weak)
+    return response
+
+def dataset_etag(data):
+    """
+    Build a strong ETag for a parsed dataset
+
+    Args:
+        data (list): List of dictionaries with ticket data
+
+    Returns:
+        str: Hex digest that changes whenever any ticket value changes
+    """
+    payload = json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest()
+
+def dataset_last_modified(timestamp):
+    """
+    Convert the stored parse timestamp into a Last-Modified datetime
+
+    Args:
+        timestamp (int or None): Seconds since the epoch saved at parse time
+
+    Returns:
+        datetime or None: UTC datetime, or None if no timestamp was stored
+    """
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(int(timestamp), tz=timezone.utc)
+
+def static_fingerprint(static_folder, filename):
+    """
+    Fingerprint a static file by its contents for cache-busting URLs
+
+    Args:
+        static_folder (str): Absolute path of the static folder
+        filename (str): File name relative to the static folder
+
+    Returns:
+        str or None: Short content hash, or None if the file does not exist
+            or lies outside the static folder
+    """
+    path = safe_join(static_folder, filename)
+    if path is None or not os.path.isfile(path):
+        return None
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return _hash_file(path, stat.st_size, stat.st_mtime_ns)
+
+@lru_cache(maxsize=64)
+def _hash_file(path, size, mtime):
+    """Hash a file in chunks, once per size and modification time"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_BYTES), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:12]